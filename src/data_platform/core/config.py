@@ -11,10 +11,16 @@ class Config:
     
     def __init__(self, config_file: Optional[str] = None):
         self.config_file = config_file or os.getenv('CONFIG_FILE', 'config/development.yaml')
+        # Cache das chaves pontuadas já resolvidas; limpo sempre que a config muda
+        self._cache: Dict[str, Any] = {}
+        # Incrementado a cada set() ou recarga, pra quem guarda valores derivados da config
+        self.revision = 0
         self.config = self._load_config()
     
     def _load_config(self) -> Dict[str, Any]:
         """Carrega o arquivo de configuração YAML/retorna a config padrão se não carregar"""
+        self._cache.clear()
+        self.revision += 1
         if not self.config_file:
             return self._get_default_config()
         config_path = Path(self.config_file)
@@ -24,7 +30,11 @@ class Config:
         
         try:
             with open(config_path, 'r') as f:
-                return yaml.safe_load(f)
+                loaded = yaml.safe_load(f)
+            # YAML vazio vira None, aí cai na config padrão também
+            if not isinstance(loaded, dict):
+                return self._get_default_config()
+            return loaded
         except Exception as e:
             print(f"Erro ao carregar o arquivo de configuração: {e}")
             return self._get_default_config()
@@ -62,6 +72,18 @@ class Config:
                 'processed': 'processed/',
                 'logs': 'logs/'
             },
+            'ingestion': {
+                'prefer_parquet': False
+            },
+            'parquet': {
+                'compression': 'snappy',
+                'compression_level': None,
+                'row_group_size': 128_000
+            },
+            'hashing': {
+                'parallel_min_size': 64 << 20,
+                'chunk_size': 16 << 20
+            },
             'validation': {
                 'isolation_forest': {
                     'contamination': 0.01,
@@ -75,6 +97,11 @@ class Config:
         }
     
     def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        
         keys = key.split('.')
         value = self.config
         
@@ -82,8 +109,10 @@ class Config:
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
+                # Chave ausente não vai pro cache, o default muda a cada chamada
                 return default
         
+        self._cache[key] = value
         return value
     
     def set(self, key: str, value: Any) -> None:
@@ -96,4 +125,6 @@ class Config:
                 config[k] = {}
             config = config[k]
         
-        config[keys[-1]] = value
\ No newline at end of file
+        config[keys[-1]] = value
+        self._cache.clear()
+        self.revision += 1
\ No newline at end of file
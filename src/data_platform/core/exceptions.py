@@ -0,0 +1,12 @@
+"""
+Exceções da plataforma
+"""
+
+class PlatformError(Exception):
+    """Erro genérico da plataforma"""
+
+class IngestionError(PlatformError):
+    """Falha na ingestão de uma fonte de dados"""
+
+class ValidationError(PlatformError):
+    """Falha na validação dos dados"""
@@ -0,0 +1,60 @@
+"""
+Hash dos arquivos gerados pela plataforma
+"""
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+def merkle_algorithm_name(chunk_size: int) -> str:
+    """Nome do algoritmo em blocos; leva o tamanho do bloco porque ele muda o digest"""
+    if chunk_size % (1 << 20) == 0:
+        return f'SHA-256-MERKLE-{chunk_size >> 20}MiB'
+    return f'SHA-256-MERKLE-{chunk_size}B'
+
+def generate_data_hash(file_path: str, parallel_min_size: int = 64 << 20,
+                       chunk_size: int = 16 << 20) -> Tuple[str, str]:
+    """
+    Gera o hash dos dados de um arquivo
+    
+    Até parallel_min_size bytes é o SHA-256 do arquivo inteiro. Acima disso
+    o arquivo é dividido em blocos de chunk_size bytes, cada bloco é
+    hasheado numa thread e o resultado é o SHA-256 da concatenação dos
+    digests (estilo Merkle). Esse valor é diferente do sha256 do arquivo e
+    depende do chunk_size, por isso o nome do algoritmo volta junto
+    
+    Returns:
+        Tupla (hash hexadecimal, algoritmo usado)
+    """
+    size = os.stat(file_path).st_size
+    
+    if size <= parallel_min_size:
+        with open(file_path, 'rb') as f:
+            # file_digest (Python 3.11+) lê em blocos grandes sem segurar a GIL
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, 'sha256').hexdigest(), 'SHA-256'
+            
+            # Python antigo: mapeia o arquivo e passa tudo num único update
+            file_hash = hashlib.sha256()
+            if size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    file_hash.update(mm)
+        
+        return file_hash.hexdigest(), 'SHA-256'
+    
+    # Tamanho de bloco fixo (e não cpu_count) pra que o hash seja o mesmo em qualquer máquina
+    n_chunks = (size + chunk_size - 1) // chunk_size
+    
+    with open(file_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            memoryview(mm) as view:
+        
+        def hash_chunk(i: int) -> bytes:
+            # O update em buffers grandes solta a GIL, então as threads rodam em paralelo
+            return hashlib.sha256(view[i * chunk_size:(i + 1) * chunk_size]).digest()
+        
+        with ThreadPoolExecutor(max_workers=min(n_chunks, os.cpu_count() or 4)) as executor:
+            digests = list(executor.map(hash_chunk, range(n_chunks)))
+    
+    return hashlib.sha256(b''.join(digests)).hexdigest(), merkle_algorithm_name(chunk_size)
@@ -0,0 +1,7 @@
+"""
+Opções do full_pipeline
+"""
+
+# Opções que o full_pipeline repassa junto pra ingestão e que não são de leitura da fonte.
+# Toda opção nova do pipeline entra aqui, senão a ingestão parquet passa a recusá-la
+PIPELINE_OPTIONS = frozenset({'validation_config', 'branch', 'source_type'})
@@ -1,75 +1,120 @@
 import logging
-from typing import Dict, Any, List, Optional
+import os
+from functools import cached_property
+from importlib import import_module
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 from pathlib import Path
-import pandas as pd
 
 from .config import Config
 from .exceptions import PlatformError, ValidationError, IngestionError
-from ..ingestion.csv_ingestion import CSVIngestion
-from ..ingestion.json_ingestion import JSONIngestion  
-from ..ingestion.excel_ingestion import ExcelIngestion
-from ..validation.anomaly_detection import AnomalyDetector
-from ..validation.data_quality import DataQualityValidator
-from ..versioning.version_manager import VersionManager
-from ..blockchain.audit_logger import AuditLogger
-from ..governance.metadata_manager import MetadataManager
+from .hashing import generate_data_hash
+from .options import PIPELINE_OPTIONS
 from ..utils.logging_config import setup_logging
 
+# pandas/sklearn e os componentes só são importados quando usados de fato
+if TYPE_CHECKING:
+    import pandas as pd
+    from ..ingestion.csv_ingestion import CSVIngestion
+    from ..ingestion.json_ingestion import JSONIngestion
+    from ..ingestion.excel_ingestion import ExcelIngestion
+    from ..ingestion.parquet_ingestion import ParquetIngestion
+    from ..validation.anomaly_detection import AnomalyDetector
+    from ..validation.data_quality import DataQualityValidator
+    from ..versioning.version_manager import VersionManager
+    from ..blockchain.audit_logger import AuditLogger
+    from ..governance.metadata_manager import MetadataManager
+
 class DataReliabilityPlatform:
     """
     Classe principal da plataforma que coordena todas as operações 
     de confiabilidade dos dados de forma integrada
     """
     
+    # Componentes criados sob demanda (cached_property) no primeiro acesso
+    _COMPONENTS = (
+        'csv_ingestion', 'json_ingestion', 'excel_ingestion', 'parquet_ingestion',
+        'anomaly_detector', 'quality_validator', 'version_manager',
+        'audit_logger', 'metadata_manager'
+    )
+    
     def __init__(self, config_file: Optional[str] = None):
         """Inicia a plataforma com as configurações necessárias"""
         self.config = Config(config_file)
         setup_logging(self.config.get('logging', {}))
         self.logger = logging.getLogger(__name__)
         
-        # Inicializa os componentes
-        self._init_components()
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_revision = -1
         
         self.logger.info("Data Reliability Platform initialized successfully")
     
-    def _init_components(self):
-        """Inicializa todos os componentes necessários da plataforma"""
+    def validate_components(self) -> None:
+        """Força a criação de todos os componentes, para falhar cedo no startup"""
+        for name in self._COMPONENTS:
+            getattr(self, name)
+    
+    def _create_component(self, module: str, class_name: str):
         try:
-            # Componentes de ingestão de dados
-            self.csv_ingestion = CSVIngestion(self.config)
-            self.json_ingestion = JSONIngestion(self.config)
-            self.excel_ingestion = ExcelIngestion(self.config)
-            
-            # Componentes de validação
-            self.anomaly_detector = AnomalyDetector(self.config)
-            self.quality_validator = DataQualityValidator(self.config)
-            
-            # Controle de versão
-            self.version_manager = VersionManager(self.config)
-            
-            # Auditoria em blockchain
-            self.audit_logger = AuditLogger(self.config)
-            
-            # Governança de dados
-            self.metadata_manager = MetadataManager(self.config)
-            
+            component_cls = getattr(import_module(module, __package__), class_name)
+            return component_cls(self.config)
         except Exception as e:
             raise PlatformError(f"Falha ao inicializar componentes da plataforma: {str(e)}")
     
+    # Componentes de ingestão de dados
+    @cached_property
+    def csv_ingestion(self) -> 'CSVIngestion':
+        return self._create_component('..ingestion.csv_ingestion', 'CSVIngestion')
+    
+    @cached_property
+    def json_ingestion(self) -> 'JSONIngestion':
+        return self._create_component('..ingestion.json_ingestion', 'JSONIngestion')
+    
+    @cached_property
+    def excel_ingestion(self) -> 'ExcelIngestion':
+        return self._create_component('..ingestion.excel_ingestion', 'ExcelIngestion')
+    
+    @cached_property
+    def parquet_ingestion(self) -> 'ParquetIngestion':
+        return self._create_component('..ingestion.parquet_ingestion', 'ParquetIngestion')
+    
+    # Componentes de validação
+    @cached_property
+    def anomaly_detector(self) -> 'AnomalyDetector':
+        return self._create_component('..validation.anomaly_detection', 'AnomalyDetector')
+    
+    @cached_property
+    def quality_validator(self) -> 'DataQualityValidator':
+        return self._create_component('..validation.data_quality', 'DataQualityValidator')
+    
+    # Controle de versão
+    @cached_property
+    def version_manager(self) -> 'VersionManager':
+        return self._create_component('..versioning.version_manager', 'VersionManager')
+    
+    # Auditoria em blockchain
+    @cached_property
+    def audit_logger(self) -> 'AuditLogger':
+        return self._create_component('..blockchain.audit_logger', 'AuditLogger')
+    
+    # Governança de dados
+    @cached_property
+    def metadata_manager(self) -> 'MetadataManager':
+        return self._create_component('..governance.metadata_manager', 'MetadataManager')
+    
     def ingest_data(self, source_path: str, source_type: str = 'auto', **kwargs) -> Dict[str, Any]:
         """
         Realiza a ingestão de dados de diferentes fontes
         
         Args:
             source_path: Caminho para a fonte de dados
-            source_type: Tipo da fonte ('csv', 'json', 'excel', 'auto')
+            source_type: Tipo da fonte ('csv', 'json', 'excel', 'parquet', 'auto')
             **kwargs: Parâmetros adicionais para a ingestão
             
         Returns:
             Dicionário com os resultados da ingestão
         """
         try:
-            self.logger.info(f"Starting data ingestion from {source_path}")
+            self.logger.info("Starting data ingestion from %s", source_path)
             
             if source_type == 'auto':
                 source_type = self._detect_source_type(source_path)
@@ -79,17 +124,19 @@ class DataReliabilityPlatform:
                 result = self.json_ingestion.ingest(source_path, **kwargs)
             elif source_type == 'excel':
                 result = self.excel_ingestion.ingest(source_path, **kwargs)
+            elif source_type == 'parquet':
+                result = self.parquet_ingestion.ingest(source_path, **kwargs)
             else:
                 raise IngestionError(f"Unsupported source type: {source_type}")
             
-            self.logger.info(f"Data ingestion completed. Processed {result.get('rows', 0)} rows")
+            self.logger.info("Data ingestion completed. Processed %s rows", result.get('rows', 0))
             return result
             
         except Exception as e:
-            self.logger.error(f"Data ingestion failed: {str(e)}")
+            self.logger.error("Data ingestion failed: %s", e)
             raise IngestionError(f"Ingestion failed: {str(e)}")
     
-    def validate_data(self, df: pd.DataFrame, validation_config: Optional[Dict] = None) -> Dict[str, Any]:
+    def validate_data(self, df: 'pd.DataFrame', validation_config: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Valida os dados usando IA e verificações de qualidade
         
@@ -126,11 +173,11 @@ class DataReliabilityPlatform:
                 'validation_passed': total_anomalies == 0 and total_quality_issues == 0
             }
             
-            self.logger.info(f"Validation completed. Found {total_anomalies} anomalies and {total_quality_issues} quality issues")
+            self.logger.info("Validation completed. Found %s anomalies and %s quality issues", total_anomalies, total_quality_issues)
             return results
             
         except Exception as e:
-            self.logger.error(f"Data validation failed: {str(e)}")
+            self.logger.error("Data validation failed: %s", e)
             raise ValidationError(f"Validation failed: {str(e)}")
     
     def version_data(self, data_path: str, message: str, branch: str = 'main') -> Dict[str, Any]:
@@ -146,15 +193,15 @@ class DataReliabilityPlatform:
             Dicionário com os resultados do versionamento
         """
         try:
-            self.logger.info(f"Creating data version for {data_path}")
+            self.logger.info("Creating data version for %s", data_path)
             
             result = self.version_manager.commit_data(data_path, message, branch)
             
-            self.logger.info(f"Data versioned successfully. Commit: {result.get('commit_id')}")
+            self.logger.info("Data versioned successfully. Commit: %s", result.get('commit_id'))
             return result
             
         except Exception as e:
-            self.logger.error(f"Data versioning failed: {str(e)}")
+            self.logger.error("Data versioning failed: %s", e)
             raise PlatformError(f"Versioning failed: {str(e)}")
     
     def audit_transaction(self, operation: str, data_hash: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
@@ -163,22 +210,22 @@ class DataReliabilityPlatform:
         
         Args:
             operation: Tipo da operação (ingestão, validação, transformação, etc.)
-            data_hash: Hash SHA-256 dos dados
+            data_hash: Hash dos dados (SHA-256, ou SHA-256 em blocos para arquivos grandes)
             metadata: Metadados adicionais da transação
             
         Returns:
             Dicionário com os detalhes da transação na chain
         """
         try:
-            self.logger.info(f"Logging audit transaction for operation: {operation}")
+            self.logger.info("Logging audit transaction for operation: %s", operation)
             
             result = self.audit_logger.log_transaction(operation, data_hash, metadata)
             
-            self.logger.info(f"Audit transaction logged. Transaction ID: {result.get('transaction_id')}")
+            self.logger.info("Audit transaction logged. Transaction ID: %s", result.get('transaction_id'))
             return result
             
         except Exception as e:
-            self.logger.error(f"Audit logging failed: {str(e)}")
+            self.logger.error("Audit logging failed: %s", e)
             raise PlatformError(f"Audit logging failed: {str(e)}")
     
     def full_pipeline(self, source_path: str, output_path: str, **kwargs) -> Dict[str, Any]:
@@ -194,7 +241,7 @@ class DataReliabilityPlatform:
             Dicionário com os resultados completos do pipeline
         """
         try:
-            self.logger.info(f"Starting full pipeline: {source_path} -> {output_path}")
+            self.logger.info("Starting full pipeline: %s -> %s", source_path, output_path)
             
             pipeline_results = {
                 'ingestion': {},
@@ -204,8 +251,10 @@ class DataReliabilityPlatform:
                 'metadata': {}
             }
             
-            # Ingestão dos dados
-            ingestion_result = self.ingest_data(source_path, **kwargs)
+            # Ingestão dos dados (opcionalmente do parquet irmão do CSV, ver _prefer_parquet_source)
+            ingest_path = self._prefer_parquet_source(source_path, output_path, kwargs)
+            ingestion_result = self.ingest_data(ingest_path, **kwargs)
+            ingestion_result['source_file'] = ingest_path
             pipeline_results['ingestion'] = ingestion_result
             df = ingestion_result['dataframe']
             
@@ -214,24 +263,26 @@ class DataReliabilityPlatform:
             pipeline_results['validation'] = validation_result
             
             # Salva os dados processados
-            processed_df = df.copy()
-            if 'anomalies' in validation_result and 'anomaly_flags' in validation_result['anomalies']:
-                processed_df = pd.concat([processed_df, validation_result['anomalies']['anomaly_flags']], axis=1)
-            
-            processed_df.to_parquet(output_path, index=False)
+            self._write_processed_data(
+                df,
+                validation_result.get('anomalies', {}).get('anomaly_flags'),
+                output_path
+            )
             
             # Versiona os dados
             version_result = self.version_data(
                 output_path, 
-                f"Processed data from {Path(source_path).name}",
+                f"Processed data from {Path(ingest_path).name}",
                 kwargs.get('branch', 'main')
             )
             pipeline_results['versioning'] = version_result
             
             # Gera hash dos dados e registra auditoria
-            data_hash = self._generate_data_hash(output_path)
+            data_hash, hash_algorithm = self._generate_data_hash(output_path)
             audit_metadata = {
-                'source_file': source_path,
+                'source_file': ingest_path,
+                'requested_source_file': source_path,
+                'hash_algorithm': hash_algorithm,
                 'output_file': output_path,
                 'rows_processed': len(df),
                 'validation_passed': validation_result['summary']['validation_passed'],
@@ -245,7 +296,7 @@ class DataReliabilityPlatform:
             metadata_result = self.metadata_manager.register_dataset(
                 output_path,
                 {
-                    'source': source_path,
+                    'source': ingest_path,
                     'pipeline_run': audit_result.get('transaction_id'),
                     'validation_summary': validation_result['summary']
                 }
@@ -256,9 +307,61 @@ class DataReliabilityPlatform:
             return pipeline_results
             
         except Exception as e:
-            self.logger.error(f"Full pipeline failed: {str(e)}")
+            self.logger.error("Full pipeline failed: %s", e)
             raise PlatformError(f"Pipeline execution failed: {str(e)}")
     
+    def _write_processed_data(self, df: 'pd.DataFrame', flags: Optional['pd.DataFrame'], output_path: str) -> None:
+        """
+        Grava os dados + flags de anomalia em parquet
+        
+        As flags entram como colunas na tabela Arrow que vai pro parquet, então
+        o dataframe da ingestão não é alterado nem copiado inteiro de novo
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        
+        if flags is not None:
+            collisions = [col for col in flags.columns if col in df.columns]
+            if collisions:
+                raise PlatformError(f"Anomaly flag columns already exist in the data: {collisions}")
+            for col in flags.columns:
+                table = table.append_column(col, pa.array(flags[col].to_numpy()))
+        
+        pq.write_table(
+            table,
+            output_path,
+            compression=self.config.get('parquet.compression', 'snappy'),
+            compression_level=self.config.get('parquet.compression_level'),
+            row_group_size=self.config.get('parquet.row_group_size', 128_000)
+        )
+    
+    def convert_to_parquet(self, source_path: str, parquet_path: Optional[str] = None, **read_csv_kwargs) -> str:
+        """
+        Gera a cópia parquet de um CSV, que o full_pipeline usa com `ingestion.prefer_parquet`
+        
+        Args:
+            source_path: CSV de origem
+            parquet_path: Destino (padrão: mesmo nome com extensão .parquet)
+            **read_csv_kwargs: Opções do pd.read_csv, as mesmas da ingestão CSV
+            
+        Returns:
+            Caminho do parquet gerado
+        """
+        from ..ingestion.parquet_ingestion import convert_csv_to_parquet
+        
+        try:
+            return convert_csv_to_parquet(
+                source_path,
+                parquet_path,
+                compression=self.config.get('parquet.compression', 'snappy'),
+                **read_csv_kwargs
+            )
+        except Exception as e:
+            self.logger.error("Parquet conversion failed: %s", e)
+            raise IngestionError(f"Parquet conversion failed: {str(e)}")
+    
     def _detect_source_type(self, source_path: str) -> str:
         """Detecta automaticamente o tipo da fonte com base na extensão do arquivo"""
         path = Path(source_path)
@@ -270,22 +373,67 @@ class DataReliabilityPlatform:
             return 'json'
         elif extension in ['.xlsx', '.xls']:
             return 'excel'
+        elif extension in ['.parquet', '.pq']:
+            return 'parquet'
         else:
             raise IngestionError(f"Unsupported file type: {extension}")
     
-    def _generate_data_hash(self, file_path: str) -> str:
-        """Gera o hash SHA-256 de um arquivo"""
-        import hashlib
+    def _prefer_parquet_source(self, source_path: str, output_path: str, kwargs: Dict[str, Any]) -> str:
+        """
+        Troca um CSV pelo .parquet de mesmo nome quando ele é igual ou mais novo que o CSV
         
-        with open(file_path, 'rb') as f:
-            file_hash = hashlib.sha256()
-            for chunk in iter(lambda: f.read(4096), b""):
-                file_hash.update(chunk)
+        Só com `ingestion.prefer_parquet` ligado, e nunca quando:
+          - o parquet irmão é o próprio output_path (seria reler a saída do run anterior)
+          - há opções de leitura do CSV (sep, dtype, ...), que o parquet não teria como aplicar
+        O parquet deve ser gerado por convert_to_parquet, pra ter os mesmos dtypes do CSV
+        """
+        if not self.config.get('ingestion.prefer_parquet', False):
+            return source_path
+        
+        path = Path(source_path)
+        if path.suffix.lower() != '.csv' or kwargs.get('source_type', 'auto') != 'auto':
+            return source_path
+        
+        reader_options = set(kwargs) - PIPELINE_OPTIONS
+        if reader_options:
+            self.logger.info("Keeping CSV source %s: reader options %s do not apply to parquet", source_path, sorted(reader_options))
+            return source_path
+        
+        parquet_path = path.with_suffix('.parquet')
+        if parquet_path.resolve() == Path(output_path).resolve():
+            return source_path
+        
+        try:
+            if os.stat(parquet_path).st_mtime >= os.stat(path).st_mtime:
+                self.logger.info("Using up-to-date parquet copy %s instead of %s", parquet_path, source_path)
+                return str(parquet_path)
+        except FileNotFoundError:
+            pass
         
-        return file_hash.hexdigest()
+        return source_path
+    
+    def _generate_data_hash(self, file_path: str) -> Tuple[str, str]:
+        """Gera o hash dos dados de um arquivo (ver core.hashing.generate_data_hash)"""
+        return generate_data_hash(
+            file_path,
+            parallel_min_size=self.config.get('hashing.parallel_min_size', 64 << 20),
+            chunk_size=self.config.get('hashing.chunk_size', 16 << 20)
+        )
     
     def get_status(self) -> Dict[str, Any]:
-        """Obtém informações sobre o status e saúde da plataforma"""
+        """
+        Obtém informações sobre o status e saúde da plataforma
+        
+        O dict é montado uma vez e reaproveitado (o endpoint de health check é
+        chamado o tempo todo); só é refeito quando a config muda via set().
+        Quem chamar não deve alterar o dict retornado
+        """
+        if self._status_cache is None or self._status_revision != self.config.revision:
+            self._status_revision = self.config.revision
+            self._status_cache = self._build_status()
+        return self._status_cache
+    
+    def _build_status(self) -> Dict[str, Any]:
         return {
             'platform': 'Data Reliability Platform',
             'version': '1.0.0',
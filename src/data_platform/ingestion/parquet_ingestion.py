@@ -0,0 +1,74 @@
+import logging
+from typing import Dict, Any, List, Optional
+from pathlib import Path
+import pandas as pd
+
+from ..core.exceptions import IngestionError
+from ..core.options import PIPELINE_OPTIONS
+
+class ParquetIngestion:
+    """Ingestão de arquivos Parquet, leitura colunar direto pelo Arrow"""
+
+    def __init__(self, config):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+
+    def ingest(self, file_path: str, columns: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Args:
+            file_path: Caminho do arquivo parquet
+            columns: Lê só essas colunas (o resto nem sai do disco)
+            **kwargs: Só as opções do pipeline (core.options.PIPELINE_OPTIONS), que são ignoradas.
+                Opções de leitor (sep, dtype, encoding...) não se aplicam a parquet
+                e geram IngestionError em vez de serem descartadas em silêncio
+
+        Returns:
+            Dicionário com o dataframe e informações básicas da leitura
+        """
+        unsupported = sorted(set(kwargs) - PIPELINE_OPTIONS)
+        if unsupported:
+            raise IngestionError(f"Unsupported options for parquet ingestion: {unsupported}")
+
+        path = Path(file_path)
+        if not path.is_file():
+            raise IngestionError(f"Parquet file not found: {file_path}")
+
+        try:
+            self.logger.info("Reading parquet file %s", file_path)
+            df = pd.read_parquet(path, engine='pyarrow', columns=columns)
+        except Exception as e:
+            raise IngestionError(f"Failed to read parquet file {file_path}: {str(e)}")
+
+        return {
+            'dataframe': df,
+            'rows': len(df),
+            'columns': list(df.columns),
+            'source_file': str(path),
+            'source_type': 'parquet'
+        }
+
+def convert_csv_to_parquet(csv_path: str, parquet_path: Optional[str] = None,
+                           compression: str = 'snappy', **read_csv_kwargs) -> str:
+    """
+    Converte um CSV pra Parquet uma vez só, pra que as próximas execuções
+    do pipeline leiam o parquet ao invés de re-tokenizar o CSV
+
+    O CSV é lido com pd.read_csv, as mesmas regras de tipo da ingestão CSV,
+    então o parquet volta com os mesmos dtypes que o CSV daria. Os
+    read_csv_kwargs precisam ser os mesmos que a ingestão CSV usaria
+
+    Args:
+        csv_path: CSV de origem
+        parquet_path: Destino (padrão: mesmo nome com extensão .parquet)
+        compression: Codec do parquet
+        **read_csv_kwargs: Repassados pro pd.read_csv
+
+    Returns:
+        Caminho do parquet gerado
+    """
+    parquet_path = parquet_path or str(Path(csv_path).with_suffix('.parquet'))
+
+    df = pd.read_csv(csv_path, **read_csv_kwargs)
+    df.to_parquet(parquet_path, index=False, engine='pyarrow', compression=compression)
+
+    return parquet_path
@@ -0,0 +1,83 @@
+"""
+Kernels numéricos da validação, compilados com numba quando ele está instalado
+"""
+import logging
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Abaixo disso o custo de chamar o kernel compilado não compensa, NumPy resolve
+NUMBA_MIN_ROWS = 10_000
+
+logger = logging.getLogger(__name__)
+
+def _zscore_hits_numpy(values: np.ndarray, mu: np.ndarray, sigma: np.ndarray, threshold: float):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_scores = np.where(sigma > 0, np.abs((values - mu) / sigma), 0.0)
+    rows, cols = np.nonzero(z_scores > threshold)
+    return rows, cols, z_scores[rows, cols]
+
+if NUMBA_AVAILABLE:
+    # Sem fastmath: ele assume que não existe NaN e as comparações com NaN deixariam de ser falsas.
+    # Sem cache em disco: ele é indexado pelo arquivo e não pelo nome do módulo, e um cache
+    # gravado importando como data_platform.* não carrega importando como src.data_platform.*
+    @njit(parallel=True)
+    def _zscore_hits_numba(values, mu, sigma, threshold):
+        n_rows, n_cols = values.shape
+
+        # 1ª passada: quantos hits por linha, pra pré-alocar a saída
+        counts = np.zeros(n_rows, dtype=np.int64)
+        for i in prange(n_rows):
+            c = 0
+            for j in range(n_cols):
+                if sigma[j] > 0 and abs((values[i, j] - mu[j]) / sigma[j]) > threshold:
+                    c += 1
+            counts[i] = c
+
+        offsets = np.zeros(n_rows + 1, dtype=np.int64)
+        for i in range(n_rows):
+            offsets[i + 1] = offsets[i] + counts[i]
+
+        total = offsets[n_rows]
+        rows = np.empty(total, dtype=np.int64)
+        cols = np.empty(total, dtype=np.int64)
+        z_out = np.empty(total, dtype=np.float64)
+
+        # 2ª passada: cada linha escreve na sua faixa, sem disputa entre threads
+        for i in prange(n_rows):
+            k = offsets[i]
+            for j in range(n_cols):
+                if sigma[j] > 0:
+                    z = abs((values[i, j] - mu[j]) / sigma[j])
+                    if z > threshold:
+                        rows[k] = i
+                        cols[k] = j
+                        z_out[k] = z
+                        k += 1
+
+        return rows, cols, z_out
+
+def zscore_hits(values: np.ndarray, mu: np.ndarray, sigma: np.ndarray, threshold: float):
+    """
+    Acha as células com |z| acima do limite
+
+    Args:
+        values: Matriz linhas x colunas
+        mu: Média de cada coluna
+        sigma: Desvio de cada coluna (colunas com sigma <= 0 ou NaN são ignoradas)
+        threshold: Limite do z-score
+
+    Returns:
+        Tupla (linhas, colunas, z_scores), ordenada por linha e depois por coluna
+    """
+    if NUMBA_AVAILABLE and values.shape[0] >= NUMBA_MIN_ROWS:
+        try:
+            return _zscore_hits_numba(np.ascontiguousarray(values), mu, sigma, float(threshold))
+        except Exception as e:
+            # numba é só aceleração: se a compilação falhar, o resultado sai igual pelo NumPy
+            logger.warning("numba z-score kernel failed, using NumPy: %s", e)
+    return _zscore_hits_numpy(values, mu, sigma, threshold)
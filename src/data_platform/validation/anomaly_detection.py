@@ -1,4 +1,5 @@
 import logging
+import warnings
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Optional, Tuple
@@ -7,18 +8,44 @@ from sklearn.cluster import DBSCAN
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 
+from ._numba_kernels import zscore_hits
+
+try:
+    from sklearn.cluster import HDBSCAN
+except ImportError:  # scikit-learn < 1.3
+    HDBSCAN = None
+
 class AnomalyDetector:
     
     def __init__(self, config):
         self.config = config
         self.logger = logging.getLogger(__name__)
-        self.isolation_config = config.get('validation.isolation_forest', {})
-        self.dbscan_config = config.get('validation.dbscan', {})
+        self._resolve_params()
         self.isolation_forest = None
         self.dbscan = None
         self.scaler = StandardScaler()
         self.pca = None
     
+    def _resolve_params(self) -> None:
+        """
+        Lê os parâmetros dos modelos da config uma vez só (o config por chamada só sobrescreve).
+        Guarda a revisão da config pra reler depois de um Config.set
+        """
+        self._config_revision = getattr(self.config, 'revision', None)
+        self.isolation_config = self.config.get('validation.isolation_forest', {})
+        self.dbscan_config = self.config.get('validation.dbscan', {})
+        
+        self._if_contamination = self.isolation_config.get('contamination', 0.01)
+        self._if_random_state = self.isolation_config.get('random_state', 42)
+        self._if_n_estimators = self.isolation_config.get('n_estimators', 100)
+        self._if_max_samples = self.isolation_config.get('max_samples', 256)
+        self._dbscan_eps = self.dbscan_config.get('eps', 0.5)
+        self._dbscan_min_samples = self.dbscan_config.get('min_samples', 5)
+        self._dbscan_algorithm = self.dbscan_config.get('algorithm', 'ball_tree')
+        self._dbscan_leaf_size = self.dbscan_config.get('leaf_size', 40)
+        # HDBSCAN só se configurado: ele não tem eps e marca ruído bem diferente do DBSCAN
+        self._hdbscan_min_rows = self.dbscan_config.get('hdbscan_min_rows')
+    
     def detect_anomalies(self, df: pd.DataFrame, config: Optional[Dict] = None) -> Dict[str, Any]:
         """        
         Args:
@@ -31,6 +58,9 @@ class AnomalyDetector:
         try:
             self.logger.info(f"Starting anomaly detection on {len(df)} rows")
             
+            if getattr(self.config, 'revision', None) != self._config_revision:
+                self._resolve_params()
+            
             # Arruma os números pra não dar ruim depois
             numeric_data = self._prepare_numeric_data(df)
             
@@ -49,13 +79,24 @@ class AnomalyDetector:
                 'summary': {}
             }
             
-            # método 1: Isolation Forest
-            if_results = self._isolation_forest_detection(numeric_data, config)
+            # normalização uma vez só, compartilhada pelos dois métodos. Escala em float64
+            # (coluna tipo epoch com desvio pequeno some em float32) e só a matriz já
+            # escalada, com valores perto de zero, vira float32 contígua pros modelos
+            try:
+                scaled_data = self.scaler.fit_transform(numeric_data.to_numpy(dtype=np.float64))
+                scaled_data = np.ascontiguousarray(scaled_data, dtype=np.float32)
+            except Exception as e:
+                # mesmo fallback de quando um dos métodos falha: zero flags, sem derrubar a validação
+                self.logger.error(f"Scaling failed: {str(e)}")
+                if_results = dbscan_results = self._no_detection(len(numeric_data))
+            else:
+                # método 1: Isolation Forest
+                if_results = self._isolation_forest_detection(scaled_data, config)
+                # método 2: DBSCAN Clustering
+                dbscan_results = self._dbscan_detection(scaled_data, config)
+            
             results['anomaly_counts']['isolation_forest'] = if_results['count']
             results['model_details']['isolation_forest'] = if_results['details']
-            
-            # método 2: DBSCAN Clustering
-            dbscan_results = self._dbscan_detection(numeric_data, config)
             results['anomaly_counts']['dbscan'] = dbscan_results['count']
             results['model_details']['dbscan'] = dbscan_results['details']
             
@@ -96,40 +137,64 @@ class AnomalyDetector:
         if not numeric_cols:
             return pd.DataFrame()
         
-        numeric_data = df[numeric_cols].copy()
+        # Fica em float64 até depois da normalização: em float32 um epoch (1.7e9) tem
+        # passo de 128, e coluna com pouca variação viraria constante no filtro abaixo
+        # copy=True: com tudo já em float64 o pandas pode devolver uma view só de leitura
+        arr = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        if arr.shape[0] == 0:
+            return pd.DataFrame()
         
-        # valores faltantes
-        numeric_data = numeric_data.fillna(numeric_data.median())
+        # valores faltantes: mediana por quickselect (np.partition), sem ordenar a coluna
+        missing = np.isnan(arr)
+        if missing.any():
+            with warnings.catch_warnings():
+                # coluna toda NaN dá mediana NaN e é descartada logo abaixo
+                warnings.simplefilter('ignore', RuntimeWarning)
+                medians = np.nanmedian(arr, axis=0)
+            rows, cols = np.nonzero(missing)
+            arr[rows, cols] = medians[cols]
         
-        # Tirar colunas com variancia zero
-        variance_filter = numeric_data.var() > 0
-        numeric_data = numeric_data.loc[:, variance_filter]
+        # Tirar colunas com variancia zero (max == min, ou NaN se a coluna era toda vazia)
+        # e colunas com ±inf, que davam variância NaN antes e quebram o StandardScaler
+        keep = np.isfinite(arr).all(axis=0) & (np.max(arr, axis=0) > np.min(arr, axis=0))
         
-        return numeric_data
+        return pd.DataFrame(
+            arr[:, keep],
+            index=df.index,
+            columns=[col for col, k in zip(numeric_cols, keep) if k]
+        )
     
-    def _isolation_forest_detection(self, data: pd.DataFrame, config: Optional[Dict] = None) -> Dict[str, Any]:
+    def _no_detection(self, n_rows: int) -> Dict[str, Any]:
+        """Resultado de um método que falhou: nenhuma linha marcada"""
+        return {'flags': np.zeros(n_rows, dtype=bool), 'count': 0, 'details': {}}
+    
+    def _isolation_forest_detection(self, scaled_data: np.ndarray, config: Optional[Dict] = None) -> Dict[str, Any]:
         try:
-            contamination = (config or {}).get('isolation_forest', {}).get('contamination', 
-                                                self.isolation_config.get('contamination', 0.01))
-            random_state = (config or {}).get('isolation_forest', {}).get('random_state',
-                                             self.isolation_config.get('random_state', 42))
+            contamination = self._if_contamination
+            random_state = self._if_random_state
+            if config and 'isolation_forest' in config:
+                overrides = config['isolation_forest']
+                contamination = overrides.get('contamination', contamination)
+                random_state = overrides.get('random_state', random_state)
             
-            # normalização
-            scaled_data = self.scaler.fit_transform(data)
+            # Train (cada árvore vê no máximo max_samples linhas, não o dataset todo).
+            # Só um inteiro é limitado ao número de linhas; 'auto' e frações vão direto pro sklearn
+            max_samples = self._if_max_samples
+            if isinstance(max_samples, int) and not isinstance(max_samples, bool):
+                max_samples = min(max_samples, len(scaled_data))
             
-            # Train 
             self.isolation_forest = IsolationForest(
+                n_estimators=self._if_n_estimators,
+                max_samples=max_samples,
                 contamination=contamination,
                 random_state=random_state,
                 n_jobs=-1
             )
+            self.isolation_forest.fit(scaled_data)
             
-            # Predict (-1 = anomalia, 1 = normal)
-            predictions = self.isolation_forest.fit_predict(scaled_data)
-            anomaly_flags = predictions == -1
-            
-            # Calcula score
+            # Calcula score uma vez só; score < 0 é exatamente o -1 do predict
             anomaly_scores = self.isolation_forest.decision_function(scaled_data)
+            anomaly_flags = anomaly_scores < 0
             
             return {
                 'flags': anomaly_flags,
@@ -144,25 +209,49 @@ class AnomalyDetector:
             
         except Exception as e:
             self.logger.error(f"Isolation Forest detection failed: {str(e)}")
-            return {'flags': np.zeros(len(data), dtype=bool), 'count': 0, 'details': {}}
+            return self._no_detection(len(scaled_data))
     
-    def _dbscan_detection(self, data: pd.DataFrame, config: Optional[Dict] = None) -> Dict[str, Any]:
+    def _dbscan_detection(self, scaled_data: np.ndarray, config: Optional[Dict] = None) -> Dict[str, Any]:
         """agrupar os dados"""
         try:
-            eps = (config or {}).get('dbscan', {}).get('eps', self.dbscan_config.get('eps', 0.5))
-            min_samples = (config or {}).get('dbscan', {}).get('min_samples', 
-                                            self.dbscan_config.get('min_samples', 5))
+            eps = self._dbscan_eps
+            min_samples = self._dbscan_min_samples
+            if config and 'dbscan' in config:
+                overrides = config['dbscan']
+                eps = overrides.get('eps', eps)
+                min_samples = overrides.get('min_samples', min_samples)
             
-            scaled_data = self.scaler.fit_transform(data)
+            features = scaled_data
             
             # Se tiver muitos dados, PCA 
-            if data.shape[1] > 10:
-                self.pca = PCA(n_components=min(10, data.shape[1]))
-                scaled_data = self.pca.fit_transform(scaled_data)
+            if scaled_data.shape[1] > 10:
+                self.pca = PCA(n_components=min(10, scaled_data.shape[1]))
+                features = self.pca.fit_transform(scaled_data)
             
-            # DBSCAN
-            self.dbscan = DBSCAN(eps=eps, min_samples=min_samples, n_jobs=-1)
-            cluster_labels = self.dbscan.fit_predict(scaled_data)
+            # DBSCAN com ball tree (busca por raio em O(n log n) em vez de pares O(n²));
+            # com `validation.dbscan.hdbscan_min_rows` definido, acima disso vai de HDBSCAN,
+            # que também marca ruído com -1
+            use_hdbscan = (
+                HDBSCAN is not None
+                and self._hdbscan_min_rows is not None
+                and len(features) > self._hdbscan_min_rows
+            )
+            if use_hdbscan:
+                algorithm = 'hdbscan'
+                min_cluster_size = max(2, min_samples)
+                self.dbscan = HDBSCAN(min_cluster_size=min_cluster_size, min_samples=min_samples, n_jobs=-1)
+                algorithm_params = {'min_cluster_size': min_cluster_size}
+            else:
+                algorithm = self._dbscan_algorithm
+                self.dbscan = DBSCAN(
+                    eps=eps,
+                    min_samples=min_samples,
+                    algorithm=algorithm,
+                    leaf_size=self._dbscan_leaf_size,
+                    n_jobs=-1
+                )
+                algorithm_params = {'eps': eps}
+            cluster_labels = self.dbscan.fit_predict(features)
             
             # anoamlia se -1
             anomaly_flags = cluster_labels == -1
@@ -174,68 +263,67 @@ class AnomalyDetector:
                 'flags': anomaly_flags,
                 'count': np.sum(anomaly_flags),
                 'details': {
-                    'eps': eps,
+                    'algorithm': algorithm,
+                    **algorithm_params,
                     'min_samples': min_samples,
                     'n_clusters': len(unique_clusters),
                     'cluster_sizes': cluster_sizes,
                     'noise_points': int(np.sum(anomaly_flags)),
-                    'pca_components': self.pca.n_components_ if self.pca else data.shape[1]
+                    'pca_components': self.pca.n_components_ if self.pca else scaled_data.shape[1]
                 }
             }
             
         except Exception as e:
             self.logger.error(f"DBSCAN detection failed: {str(e)}")
-            return {'flags': np.zeros(len(data), dtype=bool), 'count': 0, 'details': {}}
+            return self._no_detection(len(scaled_data))
     
-    def explain_anomalies(self, df: pd.DataFrame, anomaly_flags: pd.Series, top_n: int = 10) -> Dict[str, Any]:
+    def explain_anomalies(self, df: pd.DataFrame, anomaly_flags: pd.Series, top_n: Optional[int] = 10) -> Dict[str, Any]:
         """
         Explicação
         
         Args:
             df: Os dados originais
             anomaly_flags: Lista dos casos suspeitos
-            top_n: Casos mais suspeitos pra explicar
+            top_n: Casos mais suspeitos pra explicar (None explica todos)
             
         Returns:
             Um dict explicando as tretas detectadas
         """
         try:
-            anomalous_rows = df[anomaly_flags].head(top_n)
+            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            anomalous_rows = df[anomaly_flags]
+            if top_n is not None:
+                anomalous_rows = anomalous_rows.head(top_n)
             normal_rows = df[~anomaly_flags]
             
-            explanations = []
+            # média/desvio dos normais uma vez só pra todas as colunas
+            normal_mean = normal_rows[numeric_cols].mean().to_numpy(dtype=np.float64)
+            normal_std = normal_rows[numeric_cols].std().to_numpy(dtype=np.float64)
             
-            for idx, row in anomalous_rows.iterrows():
-                explanation = {
-                    'row_index': idx,
-                    'anomaly_reasons': []
-                }
-                
-                # compara com normal
-                for col in df.select_dtypes(include=[np.number]).columns:
-                    value = row[col]
-                    normal_mean = normal_rows[col].mean()
-                    normal_std = normal_rows[col].std()
-                    
-                    if normal_std > 0:
-                        z_score = abs((value - normal_mean) / normal_std)
-                        if z_score > 2:  # > 2 desvio padrao
-                            explanation['anomaly_reasons'].append({
-                                'column': col,
-                                'value': float(value),
-                                'normal_mean': float(normal_mean),
-                                'normal_std': float(normal_std),
-                                'z_score': float(z_score),
-                                'severity': 'high' if z_score > 3 else 'medium'
-                            })
-                
-                explanations.append(explanation)
+            # z-score de todas as anomalias x colunas de uma vez (numba se tiver muitas linhas)
+            values = anomalous_rows[numeric_cols].to_numpy(dtype=np.float64)
+            hit_rows, hit_cols, hit_z = zscore_hits(values, normal_mean, normal_std, 2.0)  # > 2 desvio padrao
+            
+            explanations = [
+                {'row_index': idx, 'anomaly_reasons': []}
+                for idx in anomalous_rows.index
+            ]
+            
+            for i, j, z_score in zip(hit_rows.tolist(), hit_cols.tolist(), hit_z.tolist()):
+                explanations[i]['anomaly_reasons'].append({
+                    'column': numeric_cols[j],
+                    'value': float(values[i, j]),
+                    'normal_mean': float(normal_mean[j]),
+                    'normal_std': float(normal_std[j]),
+                    'z_score': z_score,
+                    'severity': 'high' if z_score > 3 else 'medium'
+                })
             
             return {
                 'anomaly_explanations': explanations,
                 'summary': {
                     'total_anomalies_explained': len(explanations),
-                    'columns_analyzed': list(df.select_dtypes(include=[np.number]).columns)
+                    'columns_analyzed': list(numeric_cols)
                 }
             }
             
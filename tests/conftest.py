@@ -0,0 +1,24 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+# Os testes importam pelo pacote src, igual à API
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+@pytest.fixture
+def platform(monkeypatch, tmp_path):
+    """Plataforma com a config padrão; sem utils.logging_config no checkout, usa um setup_logging vazio"""
+    try:
+        import src.data_platform.utils.logging_config  # noqa: F401
+    except ModuleNotFoundError:
+        utils = types.ModuleType('src.data_platform.utils')
+        logging_config = types.ModuleType('src.data_platform.utils.logging_config')
+        logging_config.setup_logging = lambda config: None
+        utils.logging_config = logging_config
+        monkeypatch.setitem(sys.modules, 'src.data_platform.utils', utils)
+        monkeypatch.setitem(sys.modules, 'src.data_platform.utils.logging_config', logging_config)
+    
+    from src.data_platform.core.platform import DataReliabilityPlatform
+    return DataReliabilityPlatform(str(tmp_path / 'missing.yaml'))
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_platform.core.config import Config
+from src.data_platform.validation.anomaly_detection import HDBSCAN, AnomalyDetector
+
+@pytest.fixture
+def config():
+    return Config('')
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(500, 3)), columns=['a', 'b', 'c'])
+    df.iloc[:5] = 50.0
+    return df
+
+@pytest.mark.parametrize('max_samples', ['auto', 0.5, 256, 10_000])
+def test_isolation_forest_accepts_max_samples(config, data, max_samples):
+    config.set('validation.isolation_forest.max_samples', max_samples)
+
+    result = AnomalyDetector(config).detect_anomalies(data)
+
+    assert result['anomaly_counts']['isolation_forest'] > 0
+    assert result['anomaly_flags']['isolation_forest_anomaly'].iloc[:5].all()
+
+def test_dbscan_is_the_default(config, data):
+    details = AnomalyDetector(config).detect_anomalies(data)['model_details']['dbscan']
+
+    assert details['algorithm'] == 'ball_tree'
+    assert details['eps'] == 0.5
+
+def test_hdbscan_is_opt_in(config, data):
+    if HDBSCAN is None:
+        pytest.skip('scikit-learn < 1.3 has no HDBSCAN')
+    config.set('validation.dbscan.hdbscan_min_rows', 100)
+
+    details = AnomalyDetector(config).detect_anomalies(data)['model_details']['dbscan']
+
+    assert details['algorithm'] == 'hdbscan'
+    assert 'eps' not in details
+    assert details['min_cluster_size'] == 5
+
+def test_config_changes_are_picked_up(config, data):
+    detector = AnomalyDetector(config)
+    detector.detect_anomalies(data)
+
+    config.set('validation.dbscan.eps', 1.5)
+    config.set('validation.isolation_forest.contamination', 0.05)
+    result = detector.detect_anomalies(data)
+
+    assert result['model_details']['dbscan']['eps'] == 1.5
+    assert result['model_details']['isolation_forest']['contamination'] == 0.05
+
+def test_large_magnitude_columns_are_kept(config):
+    rng = np.random.default_rng(1)
+    n = 1000
+    df = pd.DataFrame({
+        'value': rng.normal(size=n),
+        # passo de 128 e 2**30+ em float32: colapsariam numa constante
+        'epoch_s': 1_700_000_000 + rng.integers(0, 5, size=n),
+        'epoch_ms': 1_700_000_000_000 + rng.integers(0, 1000, size=n),
+        'constant': np.full(n, 3.0),
+    })
+    df.loc[0, 'epoch_s'] = np.nan
+
+    detector = AnomalyDetector(config)
+    prepared = detector._prepare_numeric_data(df)
+    result = detector.detect_anomalies(df)
+
+    assert list(prepared.columns) == ['value', 'epoch_s', 'epoch_ms']
+    assert prepared['epoch_s'].nunique() == 5
+    assert result['summary']['numeric_columns_analyzed'] == ['value', 'epoch_s', 'epoch_ms']
+
+def reference_explanations(df, anomaly_flags, top_n=10):
+    """Explicação linha a linha, como era antes da versão vetorizada"""
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    normal_rows = df[~anomaly_flags]
+    explanations = []
+    for idx, row in df[anomaly_flags].head(top_n).iterrows():
+        reasons = []
+        for col in numeric_cols:
+            normal_mean = normal_rows[col].mean()
+            normal_std = normal_rows[col].std()
+            if normal_std > 0:
+                z_score = abs((row[col] - normal_mean) / normal_std)
+                if z_score > 2:
+                    reasons.append({
+                        'column': col,
+                        'value': float(row[col]),
+                        'normal_mean': float(normal_mean),
+                        'normal_std': float(normal_std),
+                        'z_score': float(z_score),
+                        'severity': 'high' if z_score > 3 else 'medium'
+                    })
+        explanations.append({'row_index': idx, 'anomaly_reasons': reasons})
+    return explanations
+
+@pytest.fixture
+def explain_data():
+    rng = np.random.default_rng(2)
+    n = 60
+    df = pd.DataFrame({
+        'x': rng.normal(size=n),
+        'label': ['row'] * n,
+        'y': rng.normal(10, 2, size=n),
+        'constant': np.full(n, 1.0),
+        'sparse': np.nan,
+    }, index=pd.RangeIndex(100, 100 + n))
+    # coluna com um único valor normal: std NaN, nunca explica nada
+    df.loc[df.index[0], 'sparse'] = 5.0
+    flags = pd.Series(False, index=df.index)
+    flags.iloc[[3, 10, 20, 30, 40]] = True
+    df.loc[df.index[3], ['x', 'y']] = [8.0, 30.0]
+    df.loc[df.index[10], 'y'] = 15.5
+    df.loc[df.index[20], ['x', 'y']] = [np.nan, -20.0]
+    df.loc[df.index[30], 'constant'] = 50.0
+    return df, flags
+
+@pytest.mark.parametrize('top_n', [10, 2, None])
+def test_explain_anomalies_matches_row_by_row(config, explain_data, top_n):
+    df, flags = explain_data
+
+    result = AnomalyDetector(config).explain_anomalies(df, flags, top_n=top_n)
+
+    expected = reference_explanations(df, flags, top_n=len(df) if top_n is None else top_n)
+    assert result['anomaly_explanations'] == expected
+    assert result['summary'] == {
+        'total_anomalies_explained': len(expected),
+        'columns_analyzed': ['x', 'y', 'constant', 'sparse'],
+    }
+
+def test_explain_anomalies_edge_cases(config, explain_data):
+    df, flags = explain_data
+
+    explanations = AnomalyDetector(config).explain_anomalies(df, flags)['anomaly_explanations']
+    reasons = {e['row_index']: [r['column'] for r in e['anomaly_reasons']] for e in explanations}
+
+    # ordem das colunas do dataframe; NaN, std 0 e std NaN não geram motivo
+    assert reasons[103] == ['x', 'y']
+    assert reasons[120] == ['y']
+    assert reasons[130] == []
+    # linhas sem motivo continuam listadas
+    assert list(reasons) == [103, 110, 120, 130, 140]
+
+def test_scaling_failure_falls_back_to_no_flags(config, data, monkeypatch):
+    detector = AnomalyDetector(config)
+
+    def fail(X):
+        raise ValueError('Input X contains infinity')
+
+    monkeypatch.setattr(detector.scaler, 'fit_transform', fail)
+    result = detector.detect_anomalies(data)
+
+    assert result['anomaly_counts'] == {'isolation_forest': 0, 'dbscan': 0}
+    assert not result['anomaly_flags']['combined_anomaly'].any()
+    assert len(result['anomaly_flags']) == len(data)
+
+def test_columns_with_infinity_are_dropped(config):
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({'a': rng.normal(size=200), 'b': rng.normal(size=200)})
+    df.loc[7, 'b'] = np.inf
+    df.loc[9, 'b'] = np.nan
+
+    result = AnomalyDetector(config).detect_anomalies(df)
+
+    assert result['summary']['numeric_columns_analyzed'] == ['a']
+    assert result['anomaly_counts']['isolation_forest'] > 0
@@ -0,0 +1,46 @@
+import hashlib
+import os
+
+from src.data_platform.core.hashing import generate_data_hash
+
+def write_file(tmp_path, size):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(os.urandom(size))
+    return path
+
+def test_small_file_is_plain_sha256(tmp_path):
+    path = write_file(tmp_path, 1000)
+
+    digest, algorithm = generate_data_hash(str(path), parallel_min_size=1 << 20)
+
+    assert digest == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert algorithm == 'SHA-256'
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'empty.bin'
+    path.write_bytes(b'')
+
+    assert generate_data_hash(str(path)) == (hashlib.sha256(b'').hexdigest(), 'SHA-256')
+
+def test_large_file_matches_manual_merkle(tmp_path):
+    chunk_size = 1 << 20
+    path = write_file(tmp_path, 5 * chunk_size + 123)
+    data = path.read_bytes()
+
+    digest, algorithm = generate_data_hash(str(path), parallel_min_size=chunk_size, chunk_size=chunk_size)
+
+    chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+    expected = hashlib.sha256(b''.join(hashlib.sha256(c).digest() for c in chunks)).hexdigest()
+    assert digest == expected
+    assert algorithm == 'SHA-256-MERKLE-1MiB'
+
+def test_algorithm_name_identifies_chunk_size(tmp_path):
+    # 6 blocos nos dois casos, mas digests diferentes: o nome precisa distinguir
+    path = write_file(tmp_path, 11 << 19)
+
+    digest_a, algorithm_a = generate_data_hash(str(path), parallel_min_size=0, chunk_size=1 << 20)
+    digest_b, algorithm_b = generate_data_hash(str(path), parallel_min_size=0, chunk_size=1_000_000)
+
+    assert digest_a != digest_b
+    assert algorithm_a == 'SHA-256-MERKLE-1MiB'
+    assert algorithm_b == 'SHA-256-MERKLE-1000000B'
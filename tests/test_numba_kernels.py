@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_platform.core.config import Config
+from src.data_platform.validation import _numba_kernels
+from src.data_platform.validation.anomaly_detection import AnomalyDetector
+from src.data_platform.validation._numba_kernels import NUMBA_MIN_ROWS, zscore_hits
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(3)
+    arr = rng.normal(size=(NUMBA_MIN_ROWS + 7, 4))
+    arr[::97, 1] = np.nan
+    arr[5, 0] = np.inf
+    return arr
+
+def stats(values):
+    # coluna 2 com sigma 0 e coluna 3 com sigma NaN: nunca geram hit
+    return np.array([0.0, 0.1, 0.0, 0.0]), np.array([1.0, 0.9, 0.0, np.nan])
+
+def assert_same_hits(actual, expected):
+    for a, e in zip(actual, expected):
+        np.testing.assert_array_equal(a, e)
+
+@pytest.mark.skipif(not _numba_kernels.NUMBA_AVAILABLE, reason='numba not installed')
+def test_numba_kernel_matches_numpy(values):
+    mu, sigma = stats(values)
+
+    expected = _numba_kernels._zscore_hits_numpy(values, mu, sigma, 2.0)
+    actual = _numba_kernels._zscore_hits_numba(values, mu, sigma, 2.0)
+
+    assert len(expected[0]) > 0
+    assert_same_hits(actual, expected)
+
+def test_zscore_hits_falls_back_to_numpy(values, monkeypatch):
+    mu, sigma = stats(values)
+
+    def broken_kernel(*args):
+        raise RuntimeError('cannot load cached kernel')
+
+    monkeypatch.setattr(_numba_kernels, 'NUMBA_AVAILABLE', True)
+    monkeypatch.setattr(_numba_kernels, '_zscore_hits_numba', broken_kernel, raising=False)
+
+    assert_same_hits(zscore_hits(values, mu, sigma, 2.0), _numba_kernels._zscore_hits_numpy(values, mu, sigma, 2.0))
+
+@pytest.mark.skipif(not _numba_kernels.NUMBA_AVAILABLE, reason='numba not installed')
+def test_explain_anomalies_same_with_and_without_numba(monkeypatch):
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame(rng.normal(size=(3 * NUMBA_MIN_ROWS, 3)), columns=['a', 'b', 'c'])
+    flags = pd.Series(rng.random(len(df)) < 0.5, index=df.index)
+    detector = AnomalyDetector(Config(''))
+
+    with_numba = detector.explain_anomalies(df, flags, top_n=None)
+    monkeypatch.setattr(_numba_kernels, 'NUMBA_AVAILABLE', False)
+    without_numba = detector.explain_anomalies(df, flags, top_n=None)
+
+    assert with_numba['anomaly_explanations']
+    assert with_numba == without_numba
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from src.data_platform.core.config import Config
+from src.data_platform.core.exceptions import IngestionError
+from src.data_platform.core.options import PIPELINE_OPTIONS
+from src.data_platform.ingestion.parquet_ingestion import ParquetIngestion, convert_csv_to_parquet
+
+CSV_CONTENT = (
+    "id,code,date,amount,label\n"
+    "1,007,2024-01-01,10.5,a\n"
+    "2,010,2024-01-02,,b\n"
+    "3,123,2024-01-03,7.25,\n"
+)
+
+@pytest.fixture
+def ingestion():
+    return ParquetIngestion(Config(''))
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text(CSV_CONTENT)
+    return path
+
+def test_ingest_reads_parquet(tmp_path, ingestion):
+    df = pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']})
+    path = tmp_path / 'data.parquet'
+    df.to_parquet(path, index=False)
+
+    result = ingestion.ingest(str(path))
+
+    pd.testing.assert_frame_equal(result['dataframe'], df)
+    assert result['rows'] == 3
+    assert result['columns'] == ['a', 'b']
+    assert result['source_type'] == 'parquet'
+
+def test_ingest_reads_only_requested_columns(tmp_path, ingestion):
+    path = tmp_path / 'data.parquet'
+    pd.DataFrame({'a': [1], 'b': [2]}).to_parquet(path, index=False)
+
+    result = ingestion.ingest(str(path), columns=['b'])
+
+    assert result['columns'] == ['b']
+
+def test_ingest_missing_file_raises(tmp_path, ingestion):
+    with pytest.raises(IngestionError):
+        ingestion.ingest(str(tmp_path / 'missing.parquet'))
+
+def test_ingest_rejects_reader_options(tmp_path, ingestion):
+    path = tmp_path / 'data.parquet'
+    pd.DataFrame({'a': [1]}).to_parquet(path, index=False)
+
+    with pytest.raises(IngestionError, match='sep'):
+        ingestion.ingest(str(path), sep=';')
+
+def test_ingest_ignores_pipeline_options(tmp_path, ingestion):
+    path = tmp_path / 'data.parquet'
+    pd.DataFrame({'a': [1]}).to_parquet(path, index=False)
+
+    result = ingestion.ingest(str(path), **{option: None for option in PIPELINE_OPTIONS})
+
+    assert result['rows'] == 1
+
+def test_convert_matches_read_csv_dtypes(csv_file):
+    parquet_path = convert_csv_to_parquet(str(csv_file))
+
+    pd.testing.assert_frame_equal(pd.read_parquet(parquet_path), pd.read_csv(csv_file))
+
+def test_convert_passes_read_csv_options(tmp_path, csv_file):
+    options = {'dtype': {'code': str}, 'parse_dates': ['date']}
+    parquet_path = convert_csv_to_parquet(str(csv_file), str(tmp_path / 'out.parquet'), **options)
+
+    df = pd.read_parquet(parquet_path)
+
+    pd.testing.assert_frame_equal(df, pd.read_csv(csv_file, **options))
+    assert df['code'].tolist() == ['007', '010', '123']
@@ -0,0 +1,146 @@
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src.data_platform.core.exceptions import PlatformError
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']})
+
+@pytest.fixture
+def flags():
+    return pd.DataFrame({
+        'isolation_forest_anomaly': [False, True, False],
+        'dbscan_anomaly': [False, False, True],
+        'combined_anomaly': [False, True, True],
+    })
+
+def test_write_processed_data_appends_flags(platform, tmp_path, frame, flags):
+    output = tmp_path / 'out.parquet'
+
+    platform._write_processed_data(frame, flags, str(output))
+
+    written = pd.read_parquet(output)
+    pd.testing.assert_frame_equal(written, pd.concat([frame, flags], axis=1))
+    # o dataframe da ingestão não ganha as colunas de flag
+    assert list(frame.columns) == ['a', 'b']
+
+def test_write_processed_data_without_flags(platform, tmp_path, frame):
+    output = tmp_path / 'out.parquet'
+
+    platform._write_processed_data(frame, None, str(output))
+    platform._write_processed_data(frame, pd.DataFrame(index=frame.index), str(output))
+
+    pd.testing.assert_frame_equal(pd.read_parquet(output), frame)
+
+def test_write_processed_data_rejects_flag_collisions(platform, tmp_path, frame, flags):
+    frame['dbscan_anomaly'] = 'user data'
+    output = tmp_path / 'out.parquet'
+
+    with pytest.raises(PlatformError, match='dbscan_anomaly'):
+        platform._write_processed_data(frame, flags, str(output))
+    assert not output.exists()
+
+def test_write_processed_data_uses_parquet_config(platform, tmp_path, frame, flags, monkeypatch):
+    calls = []
+    write_table = pq.write_table
+
+    def recording_write_table(table, where, **kwargs):
+        calls.append(kwargs)
+        write_table(table, where, **kwargs)
+
+    monkeypatch.setattr(pq, 'write_table', recording_write_table)
+    platform.config.set('parquet.compression', 'zstd')
+    platform.config.set('parquet.compression_level', 7)
+    platform.config.set('parquet.row_group_size', 2)
+
+    platform._write_processed_data(frame, flags, str(tmp_path / 'out.parquet'))
+
+    assert calls == [{'compression': 'zstd', 'compression_level': 7, 'row_group_size': 2}]
+    assert pq.ParquetFile(tmp_path / 'out.parquet').metadata.num_row_groups == 2
+
+@pytest.fixture
+def csv_with_parquet(tmp_path):
+    csv_path = tmp_path / 'data.csv'
+    csv_path.write_text('a\n1\n')
+    parquet_path = tmp_path / 'data.parquet'
+    pd.DataFrame({'a': [1]}).to_parquet(parquet_path, index=False)
+    return csv_path, parquet_path
+
+def set_mtime(path, mtime):
+    os.utime(path, (mtime, mtime))
+
+@pytest.fixture
+def prefer_parquet(platform):
+    platform.config.set('ingestion.prefer_parquet', True)
+    return platform
+
+def test_prefer_parquet_is_off_by_default(platform, tmp_path, csv_with_parquet):
+    csv_path, _ = csv_with_parquet
+
+    assert platform._prefer_parquet_source(str(csv_path), str(tmp_path / 'out.parquet'), {}) == str(csv_path)
+
+def test_prefer_parquet_uses_up_to_date_sibling(prefer_parquet, tmp_path, csv_with_parquet):
+    csv_path, parquet_path = csv_with_parquet
+    set_mtime(csv_path, 1_000)
+    set_mtime(parquet_path, 2_000)
+    options = {'branch': 'main', 'validation_config': {}, 'source_type': 'auto'}
+
+    result = prefer_parquet._prefer_parquet_source(str(csv_path), str(tmp_path / 'out.parquet'), options)
+
+    assert result == str(parquet_path)
+
+def test_prefer_parquet_skips_stale_or_missing_sibling(prefer_parquet, tmp_path, csv_with_parquet):
+    csv_path, parquet_path = csv_with_parquet
+    output = str(tmp_path / 'out.parquet')
+    set_mtime(csv_path, 2_000)
+    set_mtime(parquet_path, 1_000)
+
+    assert prefer_parquet._prefer_parquet_source(str(csv_path), output, {}) == str(csv_path)
+
+    parquet_path.unlink()
+    assert prefer_parquet._prefer_parquet_source(str(csv_path), output, {}) == str(csv_path)
+
+def test_prefer_parquet_skips_explicit_source_type(prefer_parquet, tmp_path, csv_with_parquet):
+    csv_path, _ = csv_with_parquet
+
+    result = prefer_parquet._prefer_parquet_source(str(csv_path), str(tmp_path / 'out.parquet'), {'source_type': 'csv'})
+
+    assert result == str(csv_path)
+
+def test_prefer_parquet_skips_reader_options(prefer_parquet, tmp_path, csv_with_parquet):
+    csv_path, _ = csv_with_parquet
+
+    result = prefer_parquet._prefer_parquet_source(str(csv_path), str(tmp_path / 'out.parquet'), {'sep': ';'})
+
+    assert result == str(csv_path)
+
+def test_prefer_parquet_never_reads_its_own_output(prefer_parquet, csv_with_parquet):
+    csv_path, parquet_path = csv_with_parquet
+
+    assert prefer_parquet._prefer_parquet_source(str(csv_path), str(parquet_path), {}) == str(csv_path)
+
+def test_get_status_is_cached_until_config_changes(platform):
+    status = platform.get_status()
+    assert platform.get_status() is status
+
+    platform.config.set('lakefs.endpoint', 'http://lakefs:8000')
+    rebuilt = platform.get_status()
+
+    assert rebuilt is not status
+    assert rebuilt['config']['lakefs_endpoint'] == 'http://lakefs:8000'
+    assert platform.get_status() is rebuilt
+
+def test_get_status_is_rebuilt_after_config_reload(platform, tmp_path):
+    status = platform.get_status()
+
+    config_file = tmp_path / 'reloaded.yaml'
+    config_file.write_text('lakefs:\n  endpoint: http://reloaded:8000\n')
+    platform.config.config_file = str(config_file)
+    platform.config.config = platform.config._load_config()
+
+    assert platform.get_status() is not status
+    assert platform.get_status()['config']['lakefs_endpoint'] == 'http://reloaded:8000'